@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""模型探测结果的本地 TTL 缓存
+
+别名列表一天内几乎不会变，但每次探测要花几十秒。把结果存成
+~/.claude_api_rs/models_cache.json，在 TTL 内直接复用；探测失败时
+退回陈旧缓存（stale-while-revalidate），脚本离线也能工作。
+
+环境变量：
+  CLAUDE_MODELS_CACHE_PATH      覆盖缓存文件路径
+  CLAUDE_MODELS_DISABLE_REMOTE  置为 1 时只读缓存，不发起任何探测
+"""
+
+import json
+import os
+import time
+
+DEFAULT_TTL = 86400  # 24h
+
+
+def _cache_path():
+    override = os.environ.get("CLAUDE_MODELS_CACHE_PATH")
+    if override:
+        return override
+    return os.path.join(os.path.expanduser("~"), ".claude_api_rs", "models_cache.json")
+
+
+def remote_disabled():
+    """是否被环境变量强制为只读缓存模式"""
+    return os.environ.get("CLAUDE_MODELS_DISABLE_REMOTE") == "1"
+
+
+def load(ttl=DEFAULT_TTL):
+    """读取缓存，返回 (data, fresh)
+
+    data 为 None 表示没有可用缓存；fresh 表示是否在 TTL 内。
+    CLAUDE_MODELS_DISABLE_REMOTE=1 时陈旧缓存也按 fresh 处理。
+    """
+    path = _cache_path()
+    try:
+        mtime = os.stat(path).st_mtime
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, False
+    fresh = (time.time() - mtime) < ttl or remote_disabled()
+    return data, fresh
+
+
+def save(data):
+    """把探测结果写入缓存文件"""
+    path = _cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = dict(data, ts=time.time())
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""SDK 模型探测的进程内去重缓存
+
+get_claude_models 和 use_latest_models 会对重叠的模型集合发
+语义相同的探测；按 blake2b(model + prompt) 记忆化结果后，
+同一 (模型, 提示) 的第二次探测直接命中，省掉一次约 12s 的
+子进程冷启动。哈希本身对这种短输入只要约 1µs。
+"""
+
+import hashlib
+
+_results: dict[bytes, bool] = {}
+
+
+def key(model: str, prompt: str) -> bytes:
+    return hashlib.blake2b(
+        (model + "\0" + prompt).encode(), digest_size=16
+    ).digest()
+
+
+def get(model: str, prompt: str):
+    """命中返回缓存的布尔结果，未命中返回 None"""
+    return _results.get(key(model, prompt))
+
+
+def put(model: str, prompt: str, ok: bool) -> bool:
+    _results[key(model, prompt)] = ok
+    return ok
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""共享的 ClaudeCodeOptions 构造器
+
+探测脚本里同样参数的 options 会被反复构造；用 lru_cache 按
+(model, max_turns) 记忆化，热路径上退化为一次字典查找。
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=16)
+def opts(model, max_turns=0):
+    """按模型名（和可选的 max_turns）返回缓存的 ClaudeCodeOptions"""
+    from claude_code_sdk import ClaudeCodeOptions
+
+    if max_turns:
+        return ClaudeCodeOptions(model=model, max_turns=max_turns)
+    return ClaudeCodeOptions(model=model)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""探测当前环境可用的 Claude 模型
+
+分三路探测：claude CLI 别名、claude-code-sdk、以及本地
+claude-code-api 网关的 /v1/models 接口。
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import aiohttp
+
+import _model_cache
+import _probe_cache
+import _sdk_options
+
+# 直接写 127.0.0.1，跳过 localhost 解析和 IPv6 回落
+MODELS_URL = "http://127.0.0.1:8080/v1/models"
+
+# 同时驻留的 claude 子进程上限（每个约 270-370MB 内存）
+_SUBPROCESS_LIMIT = min(4, os.cpu_count() or 2)
+
+# CLI 侧要探测的模型别名 / 全名
+MODEL_ALIASES = [
+    "opus",
+    "sonnet",
+    "haiku",
+    "opus-4.1",
+    "sonnet-4",
+    "claude-opus-4-1-20250805",
+    "claude-sonnet-4-20250514",
+    "claude-3-5-haiku-20241022",
+]
+
+# SDK 侧的探测集合
+SDK_TEST_MODELS = [
+    "opus",
+    "sonnet",
+    "opus-4.1",
+    "sonnet-4",
+    "claude-opus-4-1-20250805",
+    "claude-sonnet-4-20250514",
+]
+
+
+async def get_available_models_from_cli():
+    """并发调用 claude CLI 验证模型别名是否可用
+
+    每个别名的探测互相独立，串行跑最坏要 8 × 5s；
+    用 asyncio 子进程 + gather 并发后只需最慢那一个的时间。
+    """
+    print("\n=== 通过 CLI 探测模型 ===")
+    # 每个 claude 进程要吃 300MB 上下内存，全量并发会把小机器拖垮；
+    # 限到 4 个并发仍能拿到大部分并行收益
+    sem = asyncio.Semaphore(_SUBPROCESS_LIMIT)
+
+    async def probe(model):
+        async with sem:
+            return await _probe_unbounded(model)
+
+    async def _probe_unbounded(model):
+        proc = await asyncio.create_subprocess_exec(
+            "claude",
+            "--model",
+            model,
+            "--print",
+            "回复 ok",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            print(f"⏰ {model}: 超时")
+            return None
+        if proc.returncode == 0:
+            print(f"✅ {model}")
+            return model
+        print(f"❌ {model}: {stderr.decode().strip()[:60]}")
+        return None
+
+    # return_exceptions=True 时 gather 不会抛异常，
+    # 找不到 CLI 的情况在下面按结果逐个处理
+    results = await asyncio.gather(
+        *(probe(m) for m in MODEL_ALIASES), return_exceptions=True
+    )
+    available = []
+    for model, result in zip(MODEL_ALIASES, results):
+        if isinstance(result, FileNotFoundError):
+            print("❌ 未找到 claude CLI，跳过 CLI 探测")
+            return []
+        if isinstance(result, Exception):
+            print(f"❌ {model}: {result}")
+        elif result is not None:
+            available.append(result)
+    return available
+
+
+async def get_models_via_sdk():
+    """通过 claude-code-sdk 并发探测模型
+
+    SDK 每次 query 都要冷启动一个 claude 子进程（约 12s），
+    串行探测就是 N × 12s；gather 让这些启动互相重叠。
+    """
+    print("\n=== 通过 SDK 探测模型 ===")
+    try:
+        from claude_code_sdk import query
+    except ImportError:
+        print("❌ 未安装 claude-code-sdk，跳过 SDK 探测")
+        return []
+
+    sem = asyncio.Semaphore(_SUBPROCESS_LIMIT)
+    probe_prompt = "Reply with 'ok'"
+
+    async def probe(model):
+        # 同一 (模型, 提示) 在本进程里只探测一次
+        cached = _probe_cache.get(model, probe_prompt)
+        if cached is not None:
+            return cached
+        options = _sdk_options.opts(model, max_turns=1)
+
+        async def first_message():
+            # 第一条消息即可判定；aclose 让子进程传输立刻拆掉，
+            # 否则信号量释放后旧进程还占着内存等 GC
+            gen = query(prompt=probe_prompt, options=options)
+            try:
+                async for _message in gen:
+                    return True
+                return False
+            finally:
+                await gen.aclose()
+
+        async with sem:
+            ok = await asyncio.wait_for(first_message(), timeout=15)
+        return _probe_cache.put(model, probe_prompt, ok)
+
+    results = await asyncio.gather(
+        *(probe(m) for m in SDK_TEST_MODELS), return_exceptions=True
+    )
+    working = []
+    for model, result in zip(SDK_TEST_MODELS, results):
+        if isinstance(result, Exception):
+            print(f"❌ {model}: {result}")
+        elif result:
+            print(f"✅ {model}")
+            working.append(model)
+        else:
+            print(f"❌ {model}: 无响应")
+    return working
+
+
+# /v1/models 的进程内缓存：url -> (monotonic 时间戳, 响应体)
+_api_models_cache = {}
+_API_CACHE_TTL = 60  # 秒
+
+
+def _api_cache_path():
+    return os.path.join(os.path.expanduser("~"), ".claude_api_rs", "api_models.json")
+
+
+def _load_api_cache():
+    try:
+        with open(_api_cache_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_api_cache(etag, body):
+    path = _api_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "body": body}, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+async def check_api_models(session: aiohttp.ClientSession):
+    """查询本地 API 网关的 /v1/models 列表
+
+    复用传入的 session，避免在事件循环里发同步请求、
+    也让探测请求搭上已有的 keep-alive 连接。模型列表基本不变：
+    60s 内直接用进程内缓存；之后带 If-None-Match 条件请求，
+    命中 304 就复用磁盘缓存的响应体，省掉整个传输。
+    """
+    print("\n=== 通过 API 网关查询模型 ===")
+    now = time.monotonic()
+    hit = _api_models_cache.get(MODELS_URL)
+    if hit and now - hit[0] < _API_CACHE_TTL:
+        models = hit[1]
+    else:
+        disk = _load_api_cache()
+        headers = {}
+        if disk and disk.get("etag"):
+            headers["If-None-Match"] = disk["etag"]
+        async with session.get(MODELS_URL, headers=headers) as r:
+            if r.status == 304 and disk:
+                models = disk["body"]
+            else:
+                models = await r.json()
+                _save_api_cache(r.headers.get("ETag"), models)
+        _api_models_cache[MODELS_URL] = (now, models)
+    for m in models.get("data", []):
+        print(f"  - {m['id']}")
+    return models
+
+
+async def main():
+    # 24h 内直接用缓存结果，免掉几十秒的重复探测
+    cached, fresh = _model_cache.load()
+    if cached and fresh:
+        print("（使用缓存的探测结果，删除缓存文件或设置")
+        print("  CLAUDE_MODELS_CACHE_PATH 指向别处可强制重新探测）")
+        print("\n=== 汇总 ===")
+        print(f"CLI 可用: {cached.get('cli', [])}")
+        print(f"SDK 可用: {cached.get('sdk', [])}")
+        return
+
+    # 只读缓存模式下缓存又不可用时直接退出，绝不发起探测
+    if _model_cache.remote_disabled():
+        print("❌ CLAUDE_MODELS_DISABLE_REMOTE=1 且没有可用缓存，跳过探测")
+        return
+
+    try:
+        cli_models = await get_available_models_from_cli()
+        sdk_models = await get_models_via_sdk()
+
+        connector = aiohttp.TCPConnector(limit=16, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            try:
+                api_models = await check_api_models(session)
+            except aiohttp.ClientError as e:
+                print(f"❌ API 网关未运行？({e})")
+                api_models = None
+    except Exception as e:
+        # 探测失败时退回陈旧缓存，保证离线也有结果
+        if cached:
+            print(f"⚠️ 探测失败（{e}），使用陈旧缓存")
+            print("\n=== 汇总 ===")
+            print(f"CLI 可用: {cached.get('cli', [])}")
+            print(f"SDK 可用: {cached.get('sdk', [])}")
+            return
+        raise
+
+    _model_cache.save({"cli": cli_models, "sdk": sdk_models, "api": api_models})
+
+    print("\n=== 汇总 ===")
+    print(f"CLI 可用: {cli_models}")
+    print(f"SDK 可用: {sdk_models}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""并发请求测试脚本
+
+对本地运行的 claude-code-api (http://localhost:8080) 发起并发请求，
+验证新会话 / 同一会话 / 混合场景下的并发行为与耗时。
+"""
+
+import asyncio
+
+import httpx
+import numpy as np
+
+try:
+    # 标准 asyncio 循环下 keep-alive 复用反而可能比新建连接慢，
+    # uvloop 没有这个回归；装了就用，没装保持原样
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
+
+# 直接写 127.0.0.1：跳过 localhost 的 getaddrinfo 和先试 ::1
+# 再回落 IPv4 的弯路，建新连接时少一次解析
+API_URL = "http://127.0.0.1:8080/v1/chat/completions"
+
+# 预序列化的请求体模板：payload 只有 request_id 和可选的
+# conversation_id 会变，没必要每次请求都跑一遍 json.dumps
+_PAYLOAD_TEMPLATE = (
+    '{"model":"claude-opus-4-20250514",'
+    '"messages":[{"role":"user","content":"请回答：%d + %d = ?"}],'
+    '"stream":false%s}'
+).encode("utf-8")
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# 热路径的日志队列：send_request 只管 put_nowait，由单独的
+# writer 任务负责打印，并发协程不再在 stdout 上互相串行
+_log_q = None
+
+
+def _log(message):
+    if _log_q is None:
+        print(message)
+        return
+    try:
+        _log_q.put_nowait(message)
+    except asyncio.QueueFull:
+        # 队列塞满时宁可在当前协程里直接打印，也不丢日志
+        print(message)
+
+
+async def _log_writer(q):
+    while True:
+        message = await q.get()
+        if message is None:
+            break
+        print(message)
+
+
+async def send_request(client, request_id, conversation_id=None):
+    """发送单个请求并返回结果统计"""
+    extra = (
+        b',"conversation_id":"%s"' % conversation_id.encode()
+        if conversation_id
+        else b""
+    )
+    body = _PAYLOAD_TEMPLATE % (request_id, request_id, extra)
+
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    try:
+        response = await client.post(API_URL, content=body, headers=_JSON_HEADERS)
+        result = response.json()
+        elapsed = loop.time() - start_time
+        if response.status_code == 200:
+            content = result["choices"][0]["message"]["content"]
+            _log(f"✅ 请求 {request_id} 成功 ({elapsed:.2f}s): {content[:50]}")
+            return {
+                "request_id": request_id,
+                "success": True,
+                "elapsed": elapsed,
+                "conversation_id": result.get("conversation_id"),
+            }
+        _log(f"❌ 请求 {request_id} 失败 ({elapsed:.2f}s): {result}")
+        return {"request_id": request_id, "success": False, "elapsed": elapsed}
+    except Exception as e:
+        elapsed = loop.time() - start_time
+        _log(f"❌ 请求 {request_id} 异常 ({elapsed:.2f}s): {e}")
+        return {"request_id": request_id, "success": False, "elapsed": elapsed}
+
+
+async def gather_with_deadline(coros, request_ids, deadline=60):
+    """限时 gather 一批请求
+
+    没有上限的 gather 遇到一个卡死的请求就会把 socket 和连接池
+    一直挂着。先包成 task 再 gather：超时后已完成的结果照常收回，
+    只给没跑完的请求补失败记录，统计代码无需特判。
+    """
+    tasks = [asyncio.create_task(c) for c in coros]
+    try:
+        async with asyncio.timeout(deadline):
+            return await asyncio.gather(*tasks)
+    except TimeoutError:
+        print(f"⏰ 批量请求超过 {deadline}s，未完成的按失败计入统计")
+        results = []
+        for rid, task in zip(request_ids, tasks):
+            if task.done() and not task.cancelled():
+                results.append(task.result())
+            else:
+                results.append(
+                    {"request_id": rid, "success": False, "elapsed": float(deadline)}
+                )
+        return results
+
+
+def report(results):
+    """打印一组请求的成功率、平均耗时与尾延迟"""
+    success = [r for r in results if r["success"]]
+    print(f"成功: {len(success)}/{len(results)}")
+    if success:
+        elapsed = np.fromiter(
+            (r["elapsed"] for r in success), dtype=np.float64, count=len(success)
+        )
+        p50, p95, p99 = np.percentile(elapsed, [50, 95, 99])
+        print(f"平均耗时: {elapsed.mean():.2f}s")
+        print(f"p50/p95/p99: {p50:.2f}s / {p95:.2f}s / {p99:.2f}s")
+
+
+async def test_concurrent_new_conversations(client, num_requests=5):
+    """并发创建 num_requests 个新会话"""
+    print(f"\n=== 测试 {num_requests} 个并发新会话 ===")
+    ids = range(1, num_requests + 1)
+    results = await gather_with_deadline([send_request(client, i) for i in ids], ids)
+    report(results)
+    return results
+
+
+async def test_concurrent_same_conversation(client, num_requests=5):
+    """先建立一个会话，再向它并发发送 num_requests 个请求"""
+    print(f"\n=== 测试同一会话的 {num_requests} 个并发请求 ===")
+    initial_result = await send_request(client, 0)
+    conversation_id = initial_result.get("conversation_id")
+    if not conversation_id:
+        print("❌ 未拿到 conversation_id，跳过本测试")
+        return []
+    ids = range(1, num_requests + 1)
+    results = await gather_with_deadline(
+        [send_request(client, i, conversation_id) for i in ids], ids
+    )
+    report(results)
+    return results
+
+
+async def test_mixed_concurrent(client):
+    """混合场景：3 个新会话 + 3 个续聊同一会话，共 6 个并发请求"""
+    print("\n=== 测试混合并发（3 新会话 + 3 续聊）===")
+    initial_result = await send_request(client, 100)
+    conversation_id = initial_result.get("conversation_id")
+    ids = list(range(101, 104))
+    tasks = [send_request(client, i) for i in ids]
+    if conversation_id:
+        ids += list(range(104, 107))
+        tasks += [
+            send_request(client, i, conversation_id) for i in range(104, 107)
+        ]
+    results = await gather_with_deadline(tasks, ids)
+    report(results)
+    return results
+
+
+async def main():
+    global _log_q
+    print("开始并发测试，请确认 claude-code-api 已在 8080 端口启动")
+
+    _log_q = asyncio.Queue(maxsize=1000)
+    writer = asyncio.create_task(_log_writer(_log_q))
+
+    # 所有测试共用一个 client：连接池只预热一次；开启 HTTP/2 后
+    # 并发请求在同一条 TCP 连接上多路复用，不再一请求占一个 socket
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=30.0) as client:
+        # 两个互相独立的测试并发跑，不留空档：中间一旦闲置超过
+        # keep-alive 超时，连接被回收，下一批又要重新握手
+        await asyncio.gather(
+            test_concurrent_new_conversations(client, 5),
+            test_mixed_concurrent(client),
+        )
+        # 同会话测试依赖自己先建立的 initial_result，保持单独一步
+        await test_concurrent_same_conversation(client, 5)
+
+    # 收尾：让 writer 把队列清空后退出
+    _log_q.put_nowait(None)
+    await writer
+
+    print("\n测试完成")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""使用最新 Claude 模型（2025）的示例脚本
+
+演示通过 claude-code-sdk 调用 Opus 4.1 / Sonnet 4、批量验证
+一组模型名，以及交互式选择模型提问。
+"""
+
+import asyncio
+import os
+
+from claude_code_sdk import query
+
+import _probe_cache
+from _sdk_options import opts
+
+# (模型名, 展示用标签)
+MODELS_TO_TEST = [
+    ("opus-4.1", "Claude Opus 4.1"),
+    ("sonnet-4", "Claude Sonnet 4"),
+    ("claude-opus-4-1-20250805", "Opus 4.1 全名"),
+    ("claude-sonnet-4-20250514", "Sonnet 4 全名"),
+    ("claude-3-5-haiku-20241022", "Haiku 3.5"),
+]
+
+
+async def _stream_demo(model, prompt):
+    """流式打印响应，并记录首条消息延迟"""
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    first = True
+    async for message in query(prompt=prompt, options=opts(model)):
+        if first:
+            first = False
+            print(f"（首条消息延迟 {loop.time() - t0:.2f}s）")
+        print(message)
+
+
+async def use_opus_4_1():
+    """使用 Claude Opus 4.1（最强模型）"""
+    print("\n=== Claude Opus 4.1 ===")
+    await _stream_demo("opus-4.1", "用一句话介绍你自己")
+
+
+async def use_sonnet_4():
+    """使用 Claude Sonnet 4（日常主力模型）"""
+    print("\n=== Claude Sonnet 4 ===")
+    await _stream_demo("sonnet-4", "用一句话介绍你自己")
+
+
+async def _probe(model_name):
+    """探测单个模型：拿到首条消息即算可用
+
+    不把生成器消费到底——第一条消息就足以判定模型可用，
+    之后立刻 aclose 让 SDK 的子进程传输尽快拆掉，
+    并发探测时驻留的 claude 进程数也随之降低。
+    """
+    probe_prompt = "Say 'OK'"
+    cached = _probe_cache.get(model_name, probe_prompt)
+    if cached is not None:
+        return cached
+
+    async def first_message():
+        gen = query(prompt=probe_prompt, options=opts(model_name, max_turns=1))
+        try:
+            async for _msg in gen:
+                return True
+            return False
+        finally:
+            await gen.aclose()
+
+    ok = await asyncio.wait_for(first_message(), timeout=20)
+    return _probe_cache.put(model_name, probe_prompt, ok)
+
+
+async def list_and_test_models():
+    """并发验证 MODELS_TO_TEST 里的模型名是否可用
+
+    每次探测都要冷启动一个 claude 子进程（约 12s），
+    串行是 N × 12s；gather 并发后约等于一次启动的时间。
+    """
+    print("\n=== 验证模型可用性 ===")
+    # 限制同时驻留的 claude 子进程数（每个约 300MB 内存）
+    sem = asyncio.Semaphore(min(4, os.cpu_count() or 2))
+
+    async def bounded_probe(name):
+        async with sem:
+            return await _probe(name)
+
+    flags = await asyncio.gather(
+        *(bounded_probe(name) for name, _label in MODELS_TO_TEST),
+        return_exceptions=True,
+    )
+    for (model_name, label), flag in zip(MODELS_TO_TEST, flags):
+        if isinstance(flag, Exception):
+            print(f"❌ {label} ({model_name}): {flag}")
+        elif flag:
+            print(f"✅ {label} ({model_name})")
+        else:
+            print(f"❌ {label} ({model_name}): 无响应")
+
+
+async def _prewarm(options):
+    """发一个一次性 ping，把 claude 子进程提前拉起来"""
+    try:
+        gen = query(prompt="ping", options=options)
+        try:
+            async for _message in gen:
+                break
+        finally:
+            # 和 _probe 一样显式 aclose，预热进程不留到 GC
+            await gen.aclose()
+    except Exception:
+        # 预热失败不影响正式请求，到时再报错
+        pass
+
+
+async def _ainput(prompt):
+    """在线程池里跑 input()，不阻塞事件循环"""
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
+
+async def interactive_model_selection():
+    """交互式选择模型并提问
+
+    input() 放进 executor 执行，事件循环保持运转；选好模型后
+    立刻在后台预热 SDK 子进程（冷启动约 12s），用户打字的时间
+    正好把启动开销吃掉，回车后首个响应几乎即时。
+    """
+    print("\n=== 交互式模型选择 ===")
+    for i, (model_name, label) in enumerate(MODELS_TO_TEST, 1):
+        print(f"{i}. {label} ({model_name})")
+
+    choice = await _ainput("选择模型编号: ")
+    try:
+        model_name, label = MODELS_TO_TEST[int(choice) - 1]
+    except (ValueError, IndexError):
+        print("❌ 无效选择")
+        return
+
+    options = opts(model_name)
+    # 用户思考要问什么的同时，后台把子进程拉起来
+    warmup = asyncio.create_task(_prewarm(options))
+
+    prompt = await _ainput(f"[{label}] 请输入问题: ")
+    await warmup
+    async for message in query(prompt=prompt, options=options):
+        print(message)
+
+
+async def main():
+    print("Claude 最新模型使用示例（2025）")
+    await use_opus_4_1()
+    await use_sonnet_4()
+    await list_and_test_models()
+    await interactive_model_selection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())